@@ -22,10 +22,14 @@ setup(
     install_requires=[
         "pandas>=2.0.0",
         "numpy>=1.24.0",
+        "pyarrow>=10.0.0",
         "matplotlib>=3.7.0",
         "seaborn>=0.12.0",
         "geopandas>=0.13.0",
         "scikit-learn>=1.3.0",
         "jinja2>=3.0.0",
     ],
+    extras_require={
+        "fast": ["numba>=0.57.0"],
+    },
 )
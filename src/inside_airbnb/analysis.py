@@ -9,13 +9,103 @@ import pandas as pd
 import numpy as np
 from typing import Optional
 
+try:
+    import numba
+except ImportError:  # numba is an optional speedup
+    numba = None
+
+from .preprocessing import MONTH_NAMES
+
+
+# Groupby engine used for mean/std when none is given; 'numba' is opt-in
+# because pandas JIT-compiles its kernels afresh in every process
+DEFAULT_ENGINE = 'cython'
+
+# Month names indexed by month number (index 0 unused)
+_MONTH_NAMES = np.array([''] + MONTH_NAMES)
+
+# Integer keys up to this value are aggregated with np.bincount
+_MAX_BINCOUNT_GROUPS = 1024
+
+
+def fast_groupmean(codes: np.ndarray, values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Compute per-group means of values for small integer group codes.
+    
+    Uses two np.bincount passes instead of a hash-based groupby, which is
+    faster when the number of groups is small (boroughs, months).
+    
+    Parameters
+    ----------
+    codes : np.ndarray
+        Group code of each row, in [0, k); negative codes are ignored
+    values : np.ndarray
+        Values to average; NaN values are ignored
+    k : int
+        Number of groups
+        
+    Returns
+    -------
+    np.ndarray
+        Mean of each group (NaN for empty groups)
+        
+    Examples
+    --------
+    >>> codes = df['neighbourhood_group_cleansed'].cat.codes.to_numpy()
+    >>> means = fast_groupmean(codes, df['price'].to_numpy(), 5)
+    """
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    sums = np.bincount(codes, weights=values, minlength=k)
+    counts = np.bincount(codes, minlength=k)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _count_above_kernel(threshold, prices, codes, k, n_chunks):
+        # Each chunk fills its own row so the increments never race
+        chunk = (prices.size + n_chunks - 1) // n_chunks
+        partial = np.zeros((n_chunks, k), np.int64)
+        for c in numba.prange(n_chunks):
+            for i in range(c * chunk, min((c + 1) * chunk, prices.size)):
+                if prices[i] > threshold and codes[i] >= 0:
+                    partial[c, codes[i]] += 1
+        return partial.sum(axis=0)
+    
+    def _count_above(threshold, prices, codes, k):
+        """Count prices above threshold per group code in one parallel pass."""
+        return _count_above_kernel(threshold, prices, codes, k, numba.get_num_threads())
+else:
+    def _count_above(threshold, prices, codes, k):
+        """Count prices above threshold per group code with np.bincount."""
+        keep = (prices > threshold) & (codes >= 0)
+        return np.bincount(codes[keep], minlength=k)
+
+
+def _group_codes(keys: pd.Series):
+    """Return (codes, labels) for keys usable with bincount, or None."""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy(), keys.cat.categories
+    if pd.api.types.is_integer_dtype(keys) and keys.notna().any():
+        lo, hi = keys.min(), keys.max()
+        if lo >= 0 and hi < _MAX_BINCOUNT_GROUPS:
+            # Nullable (Int64) keys map NA to the ignored -1 code
+            return keys.to_numpy(dtype=np.int64, na_value=-1), pd.RangeIndex(hi + 1)
+    return None
+
 
 def calculate_rental_stats(df: pd.DataFrame, 
                           groupby_col: str = 'month_num',
-                          price_col: str = 'price') -> pd.DataFrame:
+                          price_col: str = 'price',
+                          engine: Optional[str] = None) -> pd.DataFrame:
     """
     Calculate rental statistics (count, mean, median, std) grouped by a column.
     
+    Count and median always use pandas' cython kernels; mean and std use
+    the cython engine unless engine='numba' is passed (requires numba).
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -24,23 +114,29 @@ def calculate_rental_stats(df: pd.DataFrame,
         Column to group by (e.g., 'month_num' for monthly stats)
     price_col : str, default='price'
         Name of the price column
+    engine : str, optional
+        Groupby engine for mean and std ('cython' or 'numba'),
+        defaults to DEFAULT_ENGINE ('cython')
         
     Returns
     -------
     pd.DataFrame
         Statistics dataframe with count, mean, median, std columns
     """
-    stats = (
-        df.groupby(groupby_col)[price_col]
-        .agg(['count', 'mean', 'median', 'std'])
-        .sort_index()
-    )
+    engine = engine or DEFAULT_ENGINE
+    engine_kwargs = {'parallel': True, 'nopython': True} if engine == 'numba' else None
+    
+    grouped = df.groupby(groupby_col, observed=True, sort=False)[price_col]
+    stats = pd.concat([
+        grouped.count().rename('count'),
+        grouped.mean(engine=engine, engine_kwargs=engine_kwargs).rename('mean'),
+        grouped.median().rename('median'),
+        grouped.std(engine=engine, engine_kwargs=engine_kwargs).rename('std'),
+    ], axis=1).sort_index()
     
     # Add month names if grouping by month_num
     if groupby_col == 'month_num':
-        stats['month'] = stats.index.map(
-            lambda x: pd.to_datetime(str(x), format='%m').month_name()
-        )
+        stats['month'] = _MONTH_NAMES[stats.index.to_numpy()]
     
     return stats
 
@@ -72,8 +168,11 @@ def compare_boroughs(df: pd.DataFrame,
     --------
     >>> comparison = compare_boroughs(df, target_borough='Manhattan')
     """
-    target_avg = df[df[borough_col] == target_borough][price_col].mean()
-    other_avg = df[df[borough_col] != target_borough][price_col].mean()
+    # One pass: the "is target borough" mask is a two-group code array
+    # Missing boroughs count as "other", as with the old two-mask version
+    is_target = df[borough_col].eq(target_borough).to_numpy(dtype=bool, na_value=False)
+    prices = df[price_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    other_avg, target_avg = fast_groupmean(is_target.astype(np.intp), prices, 2)
     
     comparison = pd.DataFrame({
         f"{target_borough}_avg_price": [target_avg],
@@ -91,6 +190,10 @@ def count_luxury_listings(df: pd.DataFrame,
     """
     Count listings above a price threshold, optionally grouped by a column.
     
+    Categorical group columns are counted by a single-pass kernel
+    (numba-compiled when numba is installed) without building the filtered
+    frame.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -107,12 +210,19 @@ def count_luxury_listings(df: pd.DataFrame,
     pd.Series or int
         Count of luxury listings (grouped if groupby_col provided)
     """
-    luxury_df = df[df[price_col] > price_threshold]
+    if not groupby_col:
+        return int((df[price_col] > price_threshold).sum())
     
-    if groupby_col:
-        return luxury_df.groupby(groupby_col).size()
-    else:
-        return len(luxury_df)
+    keys = df[groupby_col]
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        # Filter and count in a single kernel over the category codes
+        counts = _count_above(price_threshold, df[price_col].to_numpy(),
+                              keys.cat.codes.to_numpy(), len(keys.cat.categories))
+        counts = pd.Series(counts, index=keys.cat.categories.rename(groupby_col))
+        return counts[counts > 0]
+    
+    luxury_df = df[df[price_col] > price_threshold]
+    return luxury_df.groupby(groupby_col, observed=True, sort=False).size().sort_index()
 
 
 def calculate_seasonal_range(df: pd.DataFrame,
@@ -135,8 +245,46 @@ def calculate_seasonal_range(df: pd.DataFrame,
     dict
         Dictionary with min, max, range, and percentage range
     """
-    monthly_avg = df.groupby(groupby_col)[price_col].mean()
+    grouping = _group_codes(df[groupby_col])
+    if grouping is None:
+        monthly_avg = df.groupby(groupby_col, observed=True, sort=False)[price_col].mean()
+    else:
+        codes, labels = grouping
+        prices = df[price_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        means = fast_groupmean(codes, prices, len(labels))
+        monthly_avg = pd.Series(means, index=labels).dropna()
+    return _price_range(monthly_avg)
+
+
+def seasonal_range_from_stats(stats: pd.DataFrame, mean_col: str = 'mean') -> dict:
+    """
+    Calculate seasonal price variation from precomputed monthly statistics.
+    
+    Avoids a second groupby pass when calculate_rental_stats has already
+    been run on the same data.
     
+    Parameters
+    ----------
+    stats : pd.DataFrame
+        Output of calculate_rental_stats
+    mean_col : str, default='mean'
+        Name of the average price column in stats
+        
+    Returns
+    -------
+    dict
+        Dictionary with min, max, range, and percentage range
+        
+    Examples
+    --------
+    >>> stats = calculate_rental_stats(df)
+    >>> seasonal = seasonal_range_from_stats(stats)
+    """
+    return _price_range(stats[mean_col])
+
+
+def _price_range(monthly_avg: pd.Series) -> dict:
+    """Summarize the spread of a series of average prices."""
     min_price = monthly_avg.min()
     max_price = monthly_avg.max()
     price_range = max_price - min_price
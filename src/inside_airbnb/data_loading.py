@@ -5,21 +5,187 @@ This module provides functions to load and combine monthly CSV files
 from the Inside Airbnb NYC dataset.
 """
 
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 
 
-def load_monthly_listings(data_folder: Path, year: int = 2025) -> pd.DataFrame:
+# Listing columns used by the preprocessing, analysis and visualization steps
+LISTING_COLUMNS = [
+    'price', 'neighbourhood_group_cleansed', 'neighbourhood_cleansed',
+    'room_type', 'latitude', 'longitude', 'bedrooms', 'minimum_nights',
+    'number_of_reviews', 'reviews_per_month', 'calculated_host_listings_count'
+]
+
+# Dtypes declared up front so the CSV parser skips type inference
+LISTING_DTYPES = {
+    'price': 'str',
+    'neighbourhood_group_cleansed': 'str',
+    'neighbourhood_cleansed': 'str',
+    'room_type': 'str',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'bedrooms': 'float32',
+    'minimum_nights': 'float32',
+    'number_of_reviews': 'float32',
+    'reviews_per_month': 'float32',
+    'calculated_host_listings_count': 'float32'
+}
+
+# The Parquet cache is partitioned into one directory per month
+_MONTH_PARTITIONING = ds.partitioning(pa.schema([('month', pa.string())]))
+
+# Schema metadata key holding the source CSV names and mtimes of the cache
+_SOURCES_KEY = b'inside_airbnb_sources'
+
+# Characters stripped from raw price strings such as "$1,250.00"
+_PRICE_STRIP_TABLE = str.maketrans('', '', '$,')
+
+
+def parse_price(values: pd.Series) -> pd.Series:
+    """
+    Convert raw price strings to float32 in a single pass.
+    
+    Parameters
+    ----------
+    values : pd.Series
+        Raw price values (e.g. "$1,250.00"); numeric input is passed through
+        
+    Returns
+    -------
+    pd.Series
+        Numeric prices, with unparseable values set to NaN
+    """
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str).str.translate(_PRICE_STRIP_TABLE)
+    return pd.to_numeric(values, errors='coerce', downcast='float')
+
+
+def _cache_path(data_folder: Path, year: int,
+                columns: Optional[Sequence[str]]) -> Path:
+    """Return the Parquet cache directory for a given year and column selection."""
+    if columns is None:
+        key = "all"
+    else:
+        key = hashlib.md5(",".join(sorted(columns)).encode()).hexdigest()[:8]
+    return data_folder / f"listings_{year}_combined_{key}.parquet"
+
+
+def _source_manifest(files: Sequence[Path]) -> Dict[str, float]:
+    """Map each source CSV name to its modification time."""
+    return {f.name: f.stat().st_mtime for f in files}
+
+
+def _cache_is_fresh(cache_path: Path, files: Sequence[Path]) -> bool:
+    """Check that the cache was built from exactly the current source CSVs."""
+    if not any(cache_path.glob("*/*.parquet")):
+        return False
+    
+    # A partition for a month with no source CSV means a file was removed
+    months = {f.stem.split("_")[1] for f in files}
+    if not {p.name for p in cache_path.iterdir() if p.is_dir()} <= months:
+        return False
+    
+    metadata = ds.dataset(
+        cache_path, format='parquet', partitioning=_MONTH_PARTITIONING
+    ).schema.metadata or {}
+    if _SOURCES_KEY not in metadata:
+        return False
+    return json.loads(metadata[_SOURCES_KEY]) == _source_manifest(files)
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path,
+                 files: Sequence[Path]) -> None:
+    """Write the combined frame as a month-partitioned Parquet dataset."""
+    if cache_path.is_dir():
+        shutil.rmtree(cache_path)
+    elif cache_path.exists():
+        cache_path.unlink()
+    
+    # Record which files (and versions) the cache was built from
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SOURCES_KEY] = json.dumps(_source_manifest(files)).encode()
+    
+    ds.write_dataset(
+        table.replace_schema_metadata(metadata),
+        cache_path,
+        format='parquet',
+        partitioning=_MONTH_PARTITIONING,
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd')
+    )
+
+
+def _read_cache(cache_path: Path, max_price: Optional[float]) -> pd.DataFrame:
+    """Scan the Parquet cache, pushing the price filter down to the reader."""
+    dataset = ds.dataset(cache_path, format='parquet', partitioning=_MONTH_PARTITIONING)
+    price_filter = ds.field('price') < max_price if max_price is not None else None
+    return dataset.to_table(filter=price_filter).to_pandas()
+
+
+def _read_one(path: Path, columns: Optional[Sequence[str]]) -> Tuple[pd.DataFrame, str]:
+    """Read a single monthly CSV file and return it with its month name."""
+    # Extract the month name between "listings_" and "_2025"
+    month_str = path.stem.split("_")[1]
+    
+    if columns is None:
+        df = pd.read_csv(path, low_memory=False)
+    else:
+        # A callable usecols tolerates columns missing from older extracts
+        wanted = set(columns)
+        df = pd.read_csv(
+            path,
+            usecols=lambda c: c in wanted,
+            dtype={c: t for c, t in LISTING_DTYPES.items() if c in wanted}
+        )
+    
+    # Parse prices inside the worker so the raw strings never leave it
+    if 'price' in df.columns:
+        df['price'] = parse_price(df['price'])
+    
+    return df, month_str
+
+
+def load_monthly_listings(data_folder: Path, year: int = 2025,
+                          columns: Optional[Sequence[str]] = LISTING_COLUMNS,
+                          max_workers: Optional[int] = None,
+                          use_cache: bool = True,
+                          max_price: Optional[float] = None) -> pd.DataFrame:
     """
     Load and combine all monthly listing CSV files for a given year.
     
+    Files are parsed in parallel across spawned worker processes, so
+    scripts calling this must guard their entry point with
+    ``if __name__ == '__main__':``. The combined frame is cached next to
+    the CSVs as a Parquet dataset partitioned by month, and scanned with
+    pyarrow on later calls as long as it was built from the same set of
+    source files with the same modification times.
+    
     Parameters
     ----------
     data_folder : Path
         Path to the folder containing the CSV files
     year : int, default=2025
         Year of the data files to load
+    columns : Sequence[str], optional
+        Columns to read from each file, default LISTING_COLUMNS.
+        Pass None to read every column.
+    max_workers : int, optional
+        Number of worker processes (defaults to the number of CPUs)
+    use_cache : bool, default=True
+        Whether to read from and write to the Parquet cache
+    max_price : float, optional
+        Keep only listings priced below this value (exclusive). On the
+        cached path the filter is evaluated inside the Parquet scan.
         
     Returns
     -------
@@ -34,14 +200,24 @@ def load_monthly_listings(data_folder: Path, year: int = 2025) -> pd.DataFrame:
             f"Expected pattern: listings_*_{year}.csv"
         )
     
+    cache_path = _cache_path(data_folder, year, columns)
+    if use_cache and _cache_is_fresh(cache_path, files):
+        full_df = _read_cache(cache_path, max_price)
+        print(f"Loaded cached listings from {cache_path.name}")
+        print(f"\nFinal combined shape: {full_df.shape}")
+        return full_df
+    
+    workers = min(len(files), max_workers or os.cpu_count() or 1)
+    # Spawn rather than fork: forking after numba's threaded kernels have
+    # run leaves their thread pool deadlocked at interpreter exit
+    spawn = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as ex:
+        results = list(ex.map(_read_one, files, [columns] * len(files)))
+    
     dfs = []
-    loaded_files = []
+    loaded_files: List[str] = []
     
-    for f in files:
-        # Extract the month name between "listings_" and "_2025"
-        month_str = f.stem.split("_")[1]
-        
-        df = pd.read_csv(f)
+    for f, (df, month_str) in zip(files, results):
         df["month"] = month_str
         dfs.append(df)
         loaded_files.append(f.name)
@@ -49,6 +225,17 @@ def load_monthly_listings(data_folder: Path, year: int = 2025) -> pd.DataFrame:
     # Combine all dataframes
     full_df = pd.concat(dfs, ignore_index=True)
     
+    # The cache is best-effort: a failed write must not lose the loaded frame
+    if use_cache:
+        try:
+            _write_cache(full_df, cache_path, files)
+        except (OSError, pa.ArrowException) as e:
+            shutil.rmtree(cache_path, ignore_errors=True)
+            warnings.warn(f"Could not write listings cache {cache_path.name}: {e}")
+    
+    if max_price is not None:
+        full_df = full_df.loc[full_df['price'] < max_price].reset_index(drop=True)
+    
     print(f"Loaded {len(files)} files:")
     for f in loaded_files:
         print(f" - {f}")
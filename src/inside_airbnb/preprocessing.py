@@ -5,16 +5,29 @@ This module provides functions to clean and preprocess the raw Airbnb data,
 including price cleaning, month mapping, and outlier filtering.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Sequence
 
+from .data_loading import LISTING_COLUMNS, parse_price
+
+
+# Month names in calendar order
+MONTH_NAMES = [
+    'January', 'February', 'March', 'April', 'May', 'June', 
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
 
 # Month name to number mapping
-MONTH_MAPPING = {
-    'January': 1, 'February': 2, 'March': 3, 'April': 4, 
-    'May': 5, 'June': 6, 'July': 7, 'August': 8, 
-    'September': 9, 'October': 10, 'November': 11, 'December': 12
-}
+MONTH_MAPPING = {name: num for num, name in enumerate(MONTH_NAMES, start=1)}
+
+# Low-cardinality string columns stored as categoricals after preprocessing
+CATEGORICAL_COLUMNS = [
+    'neighbourhood_group_cleansed', 'neighbourhood_cleansed', 'room_type', 'month'
+]
+
+# Columns kept by preprocess_data: the loaded listing columns plus derived ones
+USED_COLUMNS = list(LISTING_COLUMNS) + ['month', 'month_num', 'log_price']
 
 
 def clean_price_column(df: pd.DataFrame, price_col: str = 'price') -> pd.DataFrame:
@@ -31,27 +44,27 @@ def clean_price_column(df: pd.DataFrame, price_col: str = 'price') -> pd.DataFra
     Returns
     -------
     pd.DataFrame
-        Dataframe with cleaned price column (numeric)
+        Dataframe with cleaned price column (float32)
     """
-    df = df.copy()
-    
-    # Remove dollar signs and commas, convert to numeric
-    df[price_col] = (
-        df[price_col]
-        .astype(str)
-        .str.replace('$', '', regex=False)
-        .str.replace(',', '', regex=False)
-    )
-    df[price_col] = pd.to_numeric(df[price_col], errors='coerce')
-    
+    df = df.copy(deep=False)
+    _clean_price_inplace(df, price_col)
     return df
 
 
+def _clean_price_inplace(df: pd.DataFrame, price_col: str = 'price') -> None:
+    """Replace the price column of df with its cleaned float32 values, in place."""
+    # Remove dollar signs and commas, convert to numeric
+    df[price_col] = parse_price(df[price_col])
+
+
 def add_month_number(df: pd.DataFrame, month_col: str = 'month', 
                      month_num_col: str = 'month_num') -> pd.DataFrame:
     """
     Add a numeric month column (1-12) from month name column.
     
+    The month column is stored as an ordered categorical over MONTH_NAMES
+    and the month number is derived from its codes as int8.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -65,18 +78,77 @@ def add_month_number(df: pd.DataFrame, month_col: str = 'month',
     -------
     pd.DataFrame
         Dataframe with added month_num column
+        
+    Raises
+    ------
+    ValueError
+        If the month column contains names not in MONTH_NAMES
+    """
+    df = df.copy(deep=False)
+    _add_month_num_inplace(df, month_col, month_num_col)
+    return df
+
+
+def _add_month_num_inplace(df: pd.DataFrame, month_col: str = 'month', 
+                           month_num_col: str = 'month_num') -> None:
+    """Add the month number column to df in place (see add_month_number)."""
+    months = pd.Categorical(df[month_col], categories=MONTH_NAMES, ordered=True)
+    
+    unknown = pd.unique(df[month_col][months.codes < 0])
+    if len(unknown):
+        raise ValueError(
+            f"Unrecognized month names in '{month_col}': {list(unknown)}. "
+            f"Expected one of {MONTH_NAMES}"
+        )
+    
+    df[month_col] = months
+    df[month_num_col] = months.codes.astype('int8') + 1
+
+
+def add_log_price(df: pd.DataFrame, price_col: str = 'price',
+                  log_price_col: str = 'log_price') -> pd.DataFrame:
+    """
+    Add a float32 log(price) column so plots don't recompute it.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataframe with numeric price column
+    price_col : str, default='price'
+        Name of the price column
+    log_price_col : str, default='log_price'
+        Name for the new log price column
+        
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with added log price column (NaN where price <= 0)
     """
-    df = df.copy()
-    df[month_num_col] = df[month_col].map(MONTH_MAPPING)
+    df = df.copy(deep=False)
+    _add_log_price_inplace(df, price_col, log_price_col)
     return df
 
 
+def _add_log_price_inplace(df: pd.DataFrame, price_col: str = 'price',
+                           log_price_col: str = 'log_price') -> None:
+    """Add the log price column to df in place (see add_log_price)."""
+    prices = df[price_col].to_numpy(dtype=np.float32)
+    log_prices = np.full(prices.shape, np.nan, dtype=np.float32)
+    np.log(prices, out=log_prices, where=prices > 0)
+    df[log_price_col] = log_prices
+
+
 def filter_price_outliers(df: pd.DataFrame, max_price: float = 5000.0, 
                          price_col: str = 'price', 
-                         verbose: bool = True) -> pd.DataFrame:
+                         verbose: bool = True,
+                         columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
     """
     Filter out listings with prices above a threshold.
     
+    The boolean mask already gathers the kept rows into a new frame, so no
+    further copy is made. When columns is given, the projection is applied
+    in the same step so unused columns are never gathered.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -87,6 +159,8 @@ def filter_price_outliers(df: pd.DataFrame, max_price: float = 5000.0,
         Name of the price column
     verbose : bool, default=True
         Whether to print filtering statistics
+    columns : Sequence[str], optional
+        Columns to keep; those missing from df are skipped. Keeps all if None.
         
     Returns
     -------
@@ -94,7 +168,14 @@ def filter_price_outliers(df: pd.DataFrame, max_price: float = 5000.0,
         Filtered dataframe
     """
     original_count = len(df)
-    df_filtered = df[df[price_col] < max_price].copy()
+    mask = df[price_col] < max_price
+    if columns is None:
+        df_filtered = df.loc[mask]
+    else:
+        df_filtered = df.loc[mask, [c for c in columns if c in df.columns]]
+    # A shallow copy clears the is-copy flag so later column assignments
+    # don't raise SettingWithCopyWarning
+    df_filtered = df_filtered.copy(deep=False)
     filtered_count = len(df_filtered)
     removed_count = original_count - filtered_count
     
@@ -105,10 +186,49 @@ def filter_price_outliers(df: pd.DataFrame, max_price: float = 5000.0,
     return df_filtered
 
 
+def get_borough_view(df: pd.DataFrame, borough: str = 'Manhattan',
+                     borough_col: str = 'neighbourhood_group_cleansed') -> pd.DataFrame:
+    """
+    Select the listings of a single borough without an extra copy.
+    
+    Compute this once and pass it to several plotting functions with
+    pre_filtered=True instead of filtering the full frame in each call.
+    The result is meant for read-only use.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataframe
+    borough : str, default='Manhattan'
+        Borough to select
+    borough_col : str, default='neighbourhood_group_cleansed'
+        Name of the borough column
+        
+    Returns
+    -------
+    pd.DataFrame
+        Rows of df in the given borough
+        
+    Examples
+    --------
+    >>> manhattan_df = get_borough_view(df, 'Manhattan')
+    """
+    return df.loc[df[borough_col] == borough]
+
+
 def preprocess_data(df: pd.DataFrame, max_price: float = 5000.0, 
-                   verbose: bool = True) -> pd.DataFrame:
+                   verbose: bool = True,
+                   columns: Optional[Sequence[str]] = USED_COLUMNS) -> pd.DataFrame:
     """
-    Complete preprocessing pipeline: clean prices, add month numbers, filter outliers.
+    Complete preprocessing pipeline: clean prices, add month numbers and
+    log prices, filter outliers.
+    
+    Columns in CATEGORICAL_COLUMNS are converted to categoricals and price is
+    stored as float32, so downstream groupbys should pass observed=True.
+    
+    The input is shallow-copied once and the cleaning steps replace columns
+    in place; the outlier filter is the only step that copies row data, and
+    it keeps only the requested columns.
     
     Parameters
     ----------
@@ -118,6 +238,8 @@ def preprocess_data(df: pd.DataFrame, max_price: float = 5000.0,
         Maximum price threshold for outlier filtering
     verbose : bool, default=True
         Whether to print progress information
+    columns : Sequence[str], optional
+        Columns to keep, default USED_COLUMNS. Pass None to keep all columns.
         
     Returns
     -------
@@ -128,14 +250,27 @@ def preprocess_data(df: pd.DataFrame, max_price: float = 5000.0,
         print("Preprocessing data...")
         print(f"  Original shape: {df.shape}")
     
+    # Columns are replaced, never written into, so the caller's frame is untouched
+    df = df.copy(deep=False)
+    
     # Clean price column
-    df = clean_price_column(df)
+    _clean_price_inplace(df)
     
     # Add month number
-    df = add_month_number(df)
+    _add_month_num_inplace(df)
+    
+    # Store grouping columns as categoricals and prices as float32
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    df['price'] = df['price'].astype('float32')
+    
+    # Cache log(price) for the log-scale plots
+    _add_log_price_inplace(df)
     
-    # Filter outliers
-    df = filter_price_outliers(df, max_price=max_price, verbose=verbose)
+    # Filter outliers and drop unused columns in one gather
+    df = filter_price_outliers(df, max_price=max_price, verbose=verbose,
+                               columns=columns)
     
     if verbose:
         print(f"  Final shape: {df.shape}")
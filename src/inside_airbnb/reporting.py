@@ -0,0 +1,123 @@
+"""
+Deferred report rendering for Inside Airbnb analysis.
+
+This module provides a Report that collects plotting and display steps
+and only runs them when rendered or saved, so batch runs can skip
+matplotlib entirely.
+"""
+
+import os
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+
+
+def is_headless() -> bool:
+    """
+    Check whether rendering should be skipped for a batch run.
+    
+    Returns
+    -------
+    bool
+        True if the HEADLESS environment variable is set to a non-false value
+    """
+    return os.environ.get('HEADLESS', '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+class Report:
+    """
+    Collect named report steps and run them only on demand.
+    
+    Parameters
+    ----------
+    headless : bool, optional
+        Skip rendering in render(); defaults to is_headless()
+        
+    Examples
+    --------
+    >>> report = Report()
+    >>> report.add('seasonal_trends', visualization.plot_seasonal_trends, df)
+    >>> report.render()
+    """
+    
+    def __init__(self, headless: Optional[bool] = None):
+        self.headless = is_headless() if headless is None else headless
+        self._steps: List[Tuple[str, Callable[[], Any]]] = []
+    
+    def add(self, name: str, func: Callable[..., Any], *args, **kwargs) -> "Report":
+        """
+        Register a step; func(*args, **kwargs) is not called until rendering.
+        
+        Parameters
+        ----------
+        name : str
+            Name of the step (also the file stem used by save)
+        func : Callable
+            Plotting or display function to call
+        *args, **kwargs
+            Arguments passed to func
+        
+        Returns
+        -------
+        Report
+            The report itself, so calls can be chained
+        """
+        self._steps.append((name, partial(func, *args, **kwargs)))
+        return self
+    
+    @property
+    def names(self) -> List[str]:
+        """Names of the registered steps, in order."""
+        return [name for name, _ in self._steps]
+    
+    def render(self) -> Dict[str, Any]:
+        """
+        Run every step and show the resulting figures.
+        
+        Does nothing when the report is headless.
+        
+        Returns
+        -------
+        dict
+            Return value of each step keyed by name (empty when headless)
+        """
+        if self.headless:
+            return {}
+        
+        results = {name: step() for name, step in self._steps}
+        plt.show()
+        return results
+    
+    def save(self, output_dir: Path, dpi: int = 300) -> List[Path]:
+        """
+        Run every step and save each returned figure as a PNG.
+        
+        Steps that don't return a (fig, ax) pair are run but not saved.
+        Figures are closed after saving.
+        
+        Parameters
+        ----------
+        output_dir : Path
+            Directory to write the figures to (created if missing)
+        dpi : int, default=300
+            Resolution of the saved figures
+        
+        Returns
+        -------
+        List[Path]
+            Paths of the saved figures
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        saved = []
+        for name, step in self._steps:
+            result = step()
+            if isinstance(result, tuple) and result and isinstance(result[0], plt.Figure):
+                path = output_dir / f"{name}.png"
+                result[0].savefig(path, dpi=dpi, bbox_inches='tight')
+                plt.close(result[0])
+                saved.append(path)
+        return saved
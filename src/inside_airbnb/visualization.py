@@ -5,28 +5,99 @@ This module provides functions for creating plots and visualizations
 of Airbnb rental price data.
 """
 
+import inspect
+import weakref
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
+
+from .preprocessing import get_borough_view
 
 
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.dpi'] = 100
 
+# Correlation matrices keyed on (id(df), columns); entries are evicted
+# when their frame is garbage collected, so a reused id never hits
+_CORR_CACHE: dict = {}
+
+# Axes.bxp replaced vert=False with orientation='horizontal' in matplotlib 3.10
+if 'orientation' in inspect.signature(plt.Axes.bxp).parameters:
+    _BXP_HORIZONTAL = {'orientation': 'horizontal'}
+else:
+    _BXP_HORIZONTAL = {'vert': False}
+
+
+def _log_prices(df: pd.DataFrame, price_col: str, log_price_col: str) -> pd.Series:
+    """Return the cached log price column, computing it only if missing."""
+    if log_price_col in df.columns:
+        return df[log_price_col]
+    return np.log(df[price_col].where(df[price_col] > 0))
+
+
+def _figure_axes(ax: Optional[plt.Axes], figsize: tuple) -> Tuple[plt.Figure, plt.Axes]:
+    """Return (fig, ax), creating a new figure only when no axes is given."""
+    if ax is None:
+        return plt.subplots(figsize=figsize)
+    return ax.figure, ax
+
+
+def _group_indices(keys: pd.Series) -> List[Tuple[object, np.ndarray]]:
+    """
+    Return (label, row positions) for each non-empty group of keys.
+    
+    Categorical keys reuse their codes; other keys are factorized once. A
+    single stable argsort then yields every group as a contiguous slice,
+    so fanning out over G groups costs one pass instead of G masks.
+    """
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        codes, labels = keys.cat.codes.to_numpy(), keys.cat.categories
+    else:
+        codes, labels = pd.factorize(keys)
+    
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+    return [(labels[i], order[bounds[i]:bounds[i + 1]])
+            for i in range(len(labels)) if bounds[i + 1] > bounds[i]]
+
+
+def _histogram_stairs(ax: plt.Axes, values: np.ndarray, keys: pd.Series,
+                      edges: np.ndarray) -> None:
+    """Draw one filled histogram per group of keys, all on the same edges."""
+    for group, idx in _group_indices(keys):
+        group_values = values[idx]
+        counts, _ = np.histogram(group_values[~np.isnan(group_values)], bins=edges)
+        ax.stairs(counts, edges, fill=True, alpha=0.5, label=group)
+
+
+def _correlation_matrix(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Return the (memoized) pairwise-complete correlation matrix of columns."""
+    key = (id(df), tuple(columns))
+    corr = _CORR_CACHE.get(key)
+    if corr is None:
+        corr = df[list(columns)].corr()
+        _CORR_CACHE[key] = corr
+        weakref.finalize(df, _CORR_CACHE.pop, key, None)
+    return corr
+
 
 def plot_price_histograms_by_borough(df: pd.DataFrame,
                                      borough_col: str = 'neighbourhood_group_cleansed',
                                      price_col: str = 'price',
                                      figsize: tuple = (10, 6),
                                      bins: int = 50,
-                                     save_path: Optional[Path] = None) -> None:
+                                     max_price: Optional[float] = None,
+                                     ax: Optional[plt.Axes] = None,
+                                     save_path: Optional[Path] = None) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plot overlapping histograms of prices by borough.
     
+    All boroughs share the same bin range so the histograms line up.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -39,24 +110,34 @@ def plot_price_histograms_by_borough(df: pd.DataFrame,
         Figure size
     bins : int, default=50
         Number of histogram bins
+    max_price : float, optional
+        Upper end of the histogram range (defaults to the maximum price)
+    ax : plt.Axes, optional
+        Axes to draw on; a new figure of figsize is created if omitted
     save_path : Path, optional
         Path to save the figure
+        
+    Returns
+    -------
+    tuple
+        (fig, ax) of the drawn plot
     """
-    plt.figure(figsize=figsize)
+    if max_price is None:
+        max_price = df[price_col].max()
+    edges = np.linspace(0, max_price, bins + 1)
     
-    for group in df[borough_col].unique():
-        subset = df[df[borough_col] == group]
-        plt.hist(subset[price_col].dropna(), bins=bins, alpha=0.5, label=group)
+    fig, ax = _figure_axes(ax, figsize)
+    _histogram_stairs(ax, df[price_col].to_numpy(dtype=np.float64), df[borough_col], edges)
     
-    plt.xlabel("Price")
-    plt.ylabel("Count")
-    plt.title("Price Histograms by Neighborhood Group (Borough)")
-    plt.legend()
+    ax.set_xlabel("Price")
+    ax.set_ylabel("Count")
+    ax.set_title("Price Histograms by Neighborhood Group (Borough)")
+    ax.legend()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    return fig, ax
 
 
 def plot_price_histogram_log_scale(df: pd.DataFrame,
@@ -64,10 +145,15 @@ def plot_price_histogram_log_scale(df: pd.DataFrame,
                                    price_col: str = 'price',
                                    figsize: tuple = (10, 6),
                                    bins: int = 50,
-                                   save_path: Optional[Path] = None) -> None:
+                                   max_price: Optional[float] = None,
+                                   log_price_col: str = 'log_price',
+                                   ax: Optional[plt.Axes] = None,
+                                   save_path: Optional[Path] = None) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plot overlapping histograms of log(price) by borough.
     
+    All boroughs share the same log-space bin edges so the histograms line up.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -80,24 +166,39 @@ def plot_price_histogram_log_scale(df: pd.DataFrame,
         Figure size
     bins : int, default=50
         Number of histogram bins
+    max_price : float, optional
+        Upper end of the histogram range (defaults to the maximum price)
+    log_price_col : str, default='log_price'
+        Name of the precomputed log price column (used if present)
+    ax : plt.Axes, optional
+        Axes to draw on; a new figure of figsize is created if omitted
     save_path : Path, optional
         Path to save the figure
+        
+    Returns
+    -------
+    tuple
+        (fig, ax) of the drawn plot
     """
-    plt.figure(figsize=figsize)
+    log_prices = _log_prices(df, price_col, log_price_col)
+    
+    # Edges span the data in log space; computed once for every borough
+    values = log_prices.to_numpy()
+    upper = np.log(max_price) if max_price is not None else np.nanmax(values)
+    edges = np.linspace(np.nanmin(values), upper, bins + 1)
     
-    for group in df[borough_col].unique():
-        subset = df[df[borough_col] == group]
-        plt.hist(np.log(subset[price_col]), bins=bins, alpha=0.5, label=group)
+    fig, ax = _figure_axes(ax, figsize)
+    _histogram_stairs(ax, values, df[borough_col], edges)
     
-    plt.xlabel("log(price)")
-    plt.ylabel("Count")
-    plt.title("Histogram of Prices (Log Scale)")
-    plt.legend()
+    ax.set_xlabel("log(price)")
+    ax.set_ylabel("Count")
+    ax.set_title("Histogram of Prices (Log Scale)")
+    ax.legend()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    return fig, ax
 
 
 def plot_manhattan_neighborhood_prices(df: pd.DataFrame,
@@ -105,8 +206,10 @@ def plot_manhattan_neighborhood_prices(df: pd.DataFrame,
                                       neighborhood_col: str = 'neighbourhood_cleansed',
                                       price_col: str = 'price',
                                       top_n: Optional[int] = None,
+                                      pre_filtered: bool = False,
                                       figsize: tuple = (14, 10),
-                                      save_path: Optional[Path] = None) -> None:
+                                      ax: Optional[plt.Axes] = None,
+                                      save_path: Optional[Path] = None) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plot average prices by neighborhood in Manhattan.
     
@@ -122,50 +225,70 @@ def plot_manhattan_neighborhood_prices(df: pd.DataFrame,
         Name of the price column
     top_n : int, optional
         Show only top N neighborhoods by average price
+    pre_filtered : bool, default=False
+        Whether df already holds only Manhattan listings
+        (e.g. from preprocessing.get_borough_view)
     figsize : tuple, default=(14, 10)
         Figure size
+    ax : plt.Axes, optional
+        Axes to draw on; a new figure of figsize is created if omitted
     save_path : Path, optional
         Path to save the figure
+        
+    Returns
+    -------
+    tuple
+        (fig, ax) of the drawn plot
     """
-    manhattan_df = df[df[borough_col] == 'Manhattan'].copy()
+    manhattan_df = df if pre_filtered else get_borough_view(df, 'Manhattan', borough_col)
     
     # Calculate average prices by neighborhood
     neighborhood_avg = (
-        manhattan_df.groupby(neighborhood_col)[price_col]
+        manhattan_df.groupby(neighborhood_col, observed=True, sort=False)[price_col]
         .mean()
-        .sort_values(descending=True)
     )
     
+    # Partial sort when only the top neighborhoods are needed
     if top_n:
-        neighborhood_avg = neighborhood_avg.head(top_n)
+        neighborhood_avg = neighborhood_avg.nlargest(top_n)
+    else:
+        neighborhood_avg = neighborhood_avg.sort_values(ascending=False)
     
-    plt.figure(figsize=figsize)
+    fig, ax = _figure_axes(ax, figsize)
     sns.barplot(
         x=neighborhood_avg.values,
-        y=neighborhood_avg.index,
-        palette='viridis'
+        y=neighborhood_avg.index.astype(str),
+        palette='viridis',
+        ax=ax
     )
-    plt.title('Average Price by Neighborhood in Manhattan', fontsize=16)
-    plt.xlabel('Average Price', fontsize=12)
-    plt.ylabel('Neighborhood', fontsize=12)
-    plt.grid(axis='x', linestyle='--', alpha=0.7)
-    plt.tight_layout()
+    ax.set_title('Average Price by Neighborhood in Manhattan', fontsize=16)
+    ax.set_xlabel('Average Price', fontsize=12)
+    ax.set_ylabel('Neighborhood', fontsize=12)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    return fig, ax
 
 
 def plot_manhattan_boxplot(df: pd.DataFrame,
                            borough_col: str = 'neighbourhood_group_cleansed',
                            neighborhood_col: str = 'neighbourhood_cleansed',
                            price_col: str = 'price',
+                           log_price_col: str = 'log_price',
+                           pre_filtered: bool = False,
                            figsize: tuple = (12, 8),
-                           save_path: Optional[Path] = None) -> None:
+                           ax: Optional[plt.Axes] = None,
+                           save_path: Optional[Path] = None) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plot boxplot of price distribution by Manhattan neighborhood (log scale).
     
+    Box statistics come from one grouped quantile pass and are drawn with
+    Axes.bxp; whiskers extend to each neighborhood's minimum and maximum
+    and individual outliers are not drawn.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -176,33 +299,65 @@ def plot_manhattan_boxplot(df: pd.DataFrame,
         Name of the neighborhood column
     price_col : str, default='price'
         Name of the price column
+    log_price_col : str, default='log_price'
+        Name of the precomputed log price column (used if present)
+    pre_filtered : bool, default=False
+        Whether df already holds only Manhattan listings
+        (e.g. from preprocessing.get_borough_view)
     figsize : tuple, default=(12, 8)
         Figure size
+    ax : plt.Axes, optional
+        Axes to draw on; a new figure of figsize is created if omitted
     save_path : Path, optional
         Path to save the figure
+        
+    Returns
+    -------
+    tuple
+        (fig, ax) of the drawn plot
     """
-    manhattan_df = df[df[borough_col] == 'Manhattan'].copy()
-    manhattan_df['log_price'] = np.log(manhattan_df[price_col])
+    manhattan_df = df if pre_filtered else get_borough_view(df, 'Manhattan', borough_col)
+    log_prices = _log_prices(manhattan_df, price_col, log_price_col)
+    
+    # Five-number summary per neighborhood, in order of first appearance
+    quantiles = (
+        log_prices.groupby(manhattan_df[neighborhood_col], observed=True, sort=False)
+        .quantile([0.0, 0.25, 0.5, 0.75, 1.0])
+        .unstack()
+        .dropna()
+    )
+    box_stats = [
+        {'label': str(name), 'whislo': row[0.0], 'q1': row[0.25], 'med': row[0.5],
+         'q3': row[0.75], 'whishi': row[1.0]}
+        for name, row in quantiles.iterrows()
+    ]
     
-    plt.figure(figsize=figsize)
-    sns.boxplot(data=manhattan_df, x='log_price', y=neighborhood_col)
-    plt.title("Price Distribution by Manhattan Neighborhood (Log Scale)")
-    plt.xlabel("Log(Price)")
-    plt.ylabel("Neighborhood")
+    fig, ax = _figure_axes(ax, figsize)
+    ax.bxp(box_stats, showfliers=False, **_BXP_HORIZONTAL)
+    ax.invert_yaxis()
+    ax.set_title("Price Distribution by Manhattan Neighborhood (Log Scale)")
+    ax.set_xlabel("Log(Price)")
+    ax.set_ylabel("Neighborhood")
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    return fig, ax
 
 
 def plot_correlation_heatmap(df: pd.DataFrame,
                             columns: List[str],
                             figsize: tuple = (10, 6),
-                            save_path: Optional[Path] = None) -> None:
+                            ax: Optional[plt.Axes] = None,
+                            save_path: Optional[Path] = None) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plot correlation heatmap for specified columns.
     
+    Each pair of columns is correlated over the rows where both are present
+    (as DataFrame.corr does), and the matrix is memoized per frame, so
+    re-plotting the same frame is cheap. Frames modified in place after the
+    first call will show stale values.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -211,28 +366,36 @@ def plot_correlation_heatmap(df: pd.DataFrame,
         List of column names to include in correlation
     figsize : tuple, default=(10, 6)
         Figure size
+    ax : plt.Axes, optional
+        Axes to draw on; a new figure of figsize is created if omitted
     save_path : Path, optional
         Path to save the figure
+        
+    Returns
+    -------
+    tuple
+        (fig, ax) of the drawn plot
     """
-    corr = df[columns].corr()
+    corr = _correlation_matrix(df, columns)
     
-    plt.figure(figsize=figsize)
+    fig, ax = _figure_axes(ax, figsize)
     sns.heatmap(corr, annot=True, fmt='.2f', cmap='bwr', center=0,
-                square=True, linewidths=0.5)
-    plt.title('Correlation Matrix for Features of Interest')
-    plt.tight_layout()
+                square=True, linewidths=0.5, ax=ax)
+    ax.set_title('Correlation Matrix for Features of Interest')
+    fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    return fig, ax
 
 
 def plot_seasonal_trends(df: pd.DataFrame,
                         groupby_col: str = 'month_num',
                         price_col: str = 'price',
                         figsize: tuple = (10, 6),
-                        save_path: Optional[Path] = None) -> None:
+                        ax: Optional[plt.Axes] = None,
+                        save_path: Optional[Path] = None) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plot average price trends over months.
     
@@ -246,21 +409,32 @@ def plot_seasonal_trends(df: pd.DataFrame,
         Name of the price column
     figsize : tuple, default=(10, 6)
         Figure size
+    ax : plt.Axes, optional
+        Axes to draw on; a new figure of figsize is created if omitted
     save_path : Path, optional
         Path to save the figure
+        
+    Returns
+    -------
+    tuple
+        (fig, ax) of the drawn plot
     """
-    monthly_avg = df.groupby(groupby_col)[price_col].mean().sort_index()
+    monthly_avg = (
+        df.groupby(groupby_col, observed=True, sort=False)[price_col]
+        .mean()
+        .sort_index()
+    )
     
-    plt.figure(figsize=figsize)
-    plt.plot(monthly_avg.index, monthly_avg.values, marker='o', linewidth=2, markersize=8)
-    plt.xlabel('Month')
-    plt.ylabel('Average Price ($)')
-    plt.title('Average Price Changes Over Months')
-    plt.grid(True, alpha=0.3)
-    plt.xticks(monthly_avg.index)
-    plt.tight_layout()
+    fig, ax = _figure_axes(ax, figsize)
+    ax.plot(monthly_avg.index, monthly_avg.values, marker='o', linewidth=2, markersize=8)
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Average Price ($)')
+    ax.set_title('Average Price Changes Over Months')
+    ax.grid(True, alpha=0.3)
+    ax.set_xticks(monthly_avg.index)
+    fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    return fig, ax